@@ -1,10 +1,25 @@
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import auto, StrEnum
-from typing import List, Optional, ClassVar, Set
-import xml.etree.ElementTree as ElementTree
+from functools import partial
+from typing import (
+    AbstractSet,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    ClassVar,
+    Sequence,
+    Tuple,
+    Union,
+)
+from lxml import etree
 import os
+import re
+import sys
 from pathlib import Path
-from subprocess import PIPE, STDOUT, CalledProcessError, Popen
+from subprocess import STDOUT, run
 
 
 def some[T](value: Optional[T]) -> T:
@@ -16,6 +31,46 @@ def some[T](value: Optional[T]) -> T:
 Name = str
 Type = str
 
+# Doxygen can emit very large XML files, and never relies on xml:id lookups.
+_XML_PARSER = etree.XMLParser(huge_tree=True, collect_ids=False)
+
+# Child paths walked for every member are compiled once. Evaluating a compiled
+# XPath is cheaper than findall(), which goes through ElementPath on each call.
+_XPATH_PARAS = etree.XPath("para")
+_XPATH_DESCRIPTION_PARAS = etree.XPath(
+    "briefdescription/para | detaileddescription/para"
+)
+_XPATH_PARAMS = etree.XPath("param")
+_XPATH_PARAMETERITEMS = etree.XPath("parameteritem")
+_XPATH_PARAMETERNAMES = etree.XPath("parameternamelist/parametername")
+_XPATH_PARAMETERDESCRIPTION_PARAS = etree.XPath("parameterdescription/para")
+_XPATH_ENUMVALUES = etree.XPath("enumvalue")
+_XPATH_MEMBERDEFS = etree.XPath("compounddef/sectiondef/memberdef")
+_XPATH_MEMBERS = etree.XPath("member")
+
+# Single children read for every member. Even for a plain tag name, find()
+# costs about twice as much as evaluating a compiled XPath.
+_XPATH_NAME = etree.XPath("name")
+_XPATH_QUALIFIEDNAME = etree.XPath("qualifiedname")
+_XPATH_TYPE = etree.XPath("type")
+_XPATH_DECLNAME = etree.XPath("declname")
+_XPATH_DEFNAME = etree.XPath("defname")
+_XPATH_DEFINITION = etree.XPath("definition")
+_XPATH_INITIALIZER = etree.XPath("initializer")
+_XPATH_LOCATION = etree.XPath("location")
+_XPATH_COMPOUNDNAME = etree.XPath("compoundname")
+_XPATH_TITLE = etree.XPath("title")
+
+
+def _find(path: etree.XPath, node: etree._Element) -> Optional[etree._Element]:
+    """
+    Returns the first node matched by the compiled path, like node.find().
+    """
+    nodes = path(node)
+    if len(nodes) == 0:
+        return None
+    return nodes[0]
+
 
 class DescriptionKind(StrEnum):
     ADMONITION = auto()
@@ -30,19 +85,19 @@ class DescriptionKind(StrEnum):
         return f"{type(self).__name__}.{self.value.upper()}"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DescriptionText:
     kind: ClassVar[DescriptionKind] = DescriptionKind.TEXT
     contents: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DescriptionParagraph:
     kind: ClassVar[DescriptionKind] = DescriptionKind.PARAGRAPH
     contents: List["Description"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DescriptionAdmonition:
     kind: ClassVar[DescriptionKind] = DescriptionKind.ADMONITION
     style: str
@@ -59,7 +114,7 @@ class ParameterDirection(StrEnum):
         return f"{type(self).__name__}.{self.value.upper()}"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DescriptionParameter:
     kind: ClassVar[DescriptionKind] = DescriptionKind.PARAMETER
     name: Name
@@ -68,14 +123,14 @@ class DescriptionParameter:
     direction: Optional[ParameterDirection] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DescriptionList:
     kind: ClassVar[DescriptionKind] = DescriptionKind.LIST
     title: Optional[str]
     contents: List["Description"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DescriptionReturn:
     kind: ClassVar[DescriptionKind] = DescriptionKind.RETURN
     description: "Description"
@@ -93,7 +148,7 @@ Description = (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class Parameter:
     type: Optional[Type]
     name: Optional[Name]
@@ -111,14 +166,14 @@ class ObjectKind(StrEnum):
         return f"{type(self).__name__}.{self.value.upper()}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     file: str
     line: int
     column: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Function:
     kind: ClassVar[ObjectKind] = ObjectKind.FUNCTION
     type: Type
@@ -136,7 +191,7 @@ class Function:
         return "func"
 
 
-@dataclass
+@dataclass(slots=True)
 class Variable:
     kind: ClassVar[ObjectKind] = ObjectKind.VARIABLE
     type: Type
@@ -151,7 +206,7 @@ class Variable:
         return "var"
 
 
-@dataclass
+@dataclass(slots=True)
 class Typedef:
     kind: ClassVar[ObjectKind] = ObjectKind.TYPEDEF
     type: Type
@@ -169,7 +224,7 @@ class Typedef:
         return "typedef"
 
 
-@dataclass
+@dataclass(slots=True)
 class Define:
     kind: ClassVar[ObjectKind] = ObjectKind.DEFINE
     name: Name
@@ -187,14 +242,14 @@ class Define:
         return "macro"
 
 
-@dataclass
+@dataclass(slots=True)
 class EnumValue:
     name: Name
     initializer: Optional[str]
     description: Description
 
 
-@dataclass
+@dataclass(slots=True)
 class Enum:
     kind: ClassVar[ObjectKind] = ObjectKind.ENUM
     name: Name
@@ -220,7 +275,7 @@ class CompoundType(StrEnum):
         return f"{type(self).__name__}.{self.value.upper()}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Compound:
     kind: ClassVar[ObjectKind] = ObjectKind.COMPOUND
     type: CompoundType
@@ -243,187 +298,198 @@ DoxygenObject = Function | Define | Enum | Variable | Typedef | Compound
 
 
 class TextParser:
+    # Tags allowed inside a <programlisting>.
+    _CODE_ALLOWLIST: ClassVar[FrozenSet[str]] = frozenset(
+        {"codeline", "highlight", "sp", "ref"}
+    )
+
     def __init__(
-        self, doxygen: Optional["Doxygen"] = None, allowlist: Optional[Set[str]] = None
+        self,
+        doxygen: Optional["Doxygen"] = None,
+        allowlist: Optional[AbstractSet[str]] = None,
     ) -> None:
         self._doxygen = doxygen
         self._allowlist = allowlist
-        self._parsers = {
-            "bold": self._parse_bold,
-            "emphasis": self._parse_emphasis,
-            "computeroutput": self._parse_computeroutput,
-            "programlisting": self._parse_programlisting,
-            "verbatim": self._parse_verbatim,
-            "codeline": self._parse_codeline,
-            "highlight": self._parse_highlight,
-            "ref": self._parse_ref,
-            "sp": self._parse_sp,
-        }
+        self._code_parser: Optional[TextParser] = None
 
     def _parse(
         self,
-        node: ElementTree.Element,
-        tag: str,
+        node: etree._Element,
+        parts: List[str],
         prefix: Optional[str] = None,
         suffix: Optional[str] = None,
-    ) -> str:
-        if node.tag != tag:
-            raise Exception(f"Invalid node {node.tag} expected {tag}")
-
-        out = ""
-
+    ) -> None:
         if prefix is not None:
-            out += prefix
+            parts.append(prefix)
 
         if node.text:
-            out += node.text
+            parts.append(node.text)
 
-        for child in list(node):
-            out += self.parse(child)
+        append = self._append
+        for child in node:
+            append(child, parts)
 
         if suffix is not None:
-            out += suffix
+            parts.append(suffix)
 
         if node.tail:
-            out += node.tail
-
-        return out
-
-    def _parse_bold(self, node: ElementTree.Element) -> str:
-        return self._parse(node, "bold", "<b>", "</b>")
-
-    def _parse_emphasis(self, node: ElementTree.Element) -> str:
-        return self._parse(node, "emphasis", "<em>", "</em>")
-
-    def _parse_computeroutput(self, node: ElementTree.Element) -> str:
-        return self._parse(node, "computeroutput", "<code>", "</code>")
-
-    def _parse_verbatim(self, node: ElementTree.Element) -> str:
-        return self._parse(
-            node, "verbatim", '<pre><code class="language-cpp">', "</code></pre>"
-        )
-
-    def _parse_codeline(self, node: ElementTree.Element) -> str:
-        return self._parse(node, "codeline", "", "")
-
-    def _parse_highlight(self, node: ElementTree.Element) -> str:
-        return self._parse(node, "highlight", "", "")
+            parts.append(node.tail)
 
-    def _parse_sp(self, node: ElementTree.Element) -> str:
-        return self._parse(node, "sp", " ", "")
-
-    def _parse_programlisting(self, node: ElementTree.Element) -> str:
+    def _parse_programlisting(self, node: etree._Element, parts: List[str]) -> None:
         language = node.get("filename")
         if language is not None:
             assert language.startswith(".")
             language = language[1:]
         prefix = f"\n```{language or ''}\n"
-        code_parser = self.with_allowlist({"codeline", "highlight", "sp", "ref"})
-        return code_parser._parse(node, "programlisting", prefix, "```\n")
+        if self._code_parser is None:
+            self._code_parser = self.with_allowlist(self._CODE_ALLOWLIST)
+        self._code_parser._parse(node, parts, prefix, "```\n")
 
-    def _parse_ref(self, node: ElementTree.Element) -> str:
-        if len(list(node)) != 0:
+    def _parse_ref(self, node: etree._Element, parts: List[str]) -> None:
+        if len(node) != 0:
             raise ValueError(
                 f"Unexpected children in <ref> tag with refid={node.get('refid')}"
             )
         out = node.text
         if self._doxygen is not None:
             qualified_name = self._doxygen.find_qualified_name(node)
-            out.replace("[", "\\[")
-            out.replace("]", "\\]")
+            out = out.replace("[", "\\[").replace("]", "\\]")
             out = f"[{out}][{qualified_name}]"
+        parts.append(out)
 
         if node.tail:
-            out += node.tail
-
-        return out
+            parts.append(node.tail)
 
-    def with_allowlist(self, allowlist: Set[str]) -> "TextParser":
+    def with_allowlist(self, allowlist: AbstractSet[str]) -> "TextParser":
         return TextParser(doxygen=self._doxygen, allowlist=allowlist)
 
-    def parse(self, node: ElementTree.Element) -> str:
-        out = ""
-        if self._allowlist is not None and node.tag not in self._allowlist:
-            raise ValueError(f"Illegal tag '{node.tag}' in Doxygen XML")
-        if node.tag in self._parsers:
-            out += self._parsers[node.tag](node)
-        else:
-            raise ValueError(f"Unexpected tag '{node.tag}' in Doxygen XML")
-        return out
-
-
-def parse_simple_text(node: ElementTree.Element) -> str:
+    # Handler for each supported tag. Tags that only wrap their contents bind
+    # their prefix and suffix up front, so dispatch is a single lookup and call.
+    _HANDLERS: ClassVar[Dict[str, Callable[..., None]]] = {
+        "bold": partial(_parse, prefix="<b>", suffix="</b>"),
+        "emphasis": partial(_parse, prefix="<em>", suffix="</em>"),
+        "computeroutput": partial(_parse, prefix="<code>", suffix="</code>"),
+        "verbatim": partial(
+            _parse, prefix='<pre><code class="language-cpp">', suffix="</code></pre>"
+        ),
+        "codeline": _parse,
+        "highlight": _parse,
+        "sp": partial(_parse, prefix=" "),
+        "ref": _parse_ref,
+        "programlisting": _parse_programlisting,
+    }
+
+    def _append(self, node: etree._Element, parts: List[str]) -> None:
+        """
+        Appends the text of the node to parts. Nested nodes append to the same
+        list, so the text is only joined once, at the top level.
+        """
+        tag = node.tag
+        if self._allowlist is not None and tag not in self._allowlist:
+            raise ValueError(f"Illegal tag '{tag}' in Doxygen XML")
+        handler = self._HANDLERS.get(tag)
+        if handler is None:
+            raise ValueError(f"Unexpected tag '{tag}' in Doxygen XML")
+        handler(self, node, parts)
+
+    def parse(self, node: etree._Element) -> str:
+        parts = []
+        self._append(node, parts)
+        return "".join(parts)
+
+
+def parse_simple_text(node: etree._Element) -> str:
     """
     Parses text from an arbitrary node that may only contain "ref" children.
     The references are ignored.
     """
-    parser = TextParser(allowlist={"ref"})
-
-    text = ""
+    parts = []
     if node.text:
-        text += node.text
+        parts.append(node.text)
 
-    for child in list(node):
-        text += parser.parse(child)
+    for child in node:
+        if child.tag != "ref":
+            raise ValueError(f"Illegal tag '{child.tag}' in Doxygen XML")
+        if len(child) != 0:
+            raise ValueError(
+                f"Unexpected children in <ref> tag with refid={child.get('refid')}"
+            )
+        if child.text:
+            parts.append(child.text)
+        if child.tail:
+            parts.append(child.tail)
 
     if node.tail:
-        text += node.tail
+        parts.append(node.tail)
+
+    return "".join(parts).strip()
 
-    return text.strip()
+
+_NORMALIZE_TYPE_RE = re.compile(r"< | >| &| \*")
 
 
 def normalize_type(type_: Type) -> Type:
-    type_ = type_.replace("< ", "<").replace(" >", ">")
-    return type_.replace(" &", "&").replace(" *", "*")
+    return _NORMALIZE_TYPE_RE.sub(lambda m: m.group(0).strip(), type_)
+
+
+_ADMONITION_STYLES = {
+    "note": "note",
+    "warning": "warning",
+    # TODO: use a different style for TODOs
+    "todo": "warning",
+    "bug": "bug",
+    "remark": "info",
+}
+
+_ADMONITION_TITLES = {
+    "note": "Note",
+    "warning": "Warning",
+    "todo": "TODO",
+    "bug": "Bug",
+    "remark": "Remark",
+}
 
 
 def is_admonition(kind: str) -> bool:
-    return kind in {"note", "warning", "todo", "bug", "remark"}
+    return kind in _ADMONITION_STYLES
 
 
 def admonition_style(kind: str) -> str:
-    return {
-        "note": "note",
-        "warning": "warning",
-        # TODO: use a different style for TODOs
-        "todo": "warning",
-        "bug": "bug",
-        "remark": "info",
-    }[kind]
+    return _ADMONITION_STYLES[kind]
 
 
 def admonition_title(kind: str) -> str:
-    return {
-        "note": "Note",
-        "warning": "Warning",
-        "todo": "TODO",
-        "bug": "Bug",
-        "remark": "Remark",
-    }[kind]
+    return _ADMONITION_TITLES[kind]
 
 
-def parse_name(node: Optional[ElementTree.Element]) -> Optional[Name]:
+# Names and types repeat heavily across a project (e.g. size_t, ZSTD_CCtx*), so
+# they are interned to share storage and make comparisons cheap.
+def parse_name(node: Optional[etree._Element]) -> Optional[Name]:
     if node is None:
         return None
-    return parse_simple_text(node)
+    return sys.intern(parse_simple_text(node))
 
 
-def parse_type(node: Optional[ElementTree.Element]) -> Optional[Type]:
+def parse_type(node: Optional[etree._Element]) -> Optional[Type]:
     if node is None:
         return None
     name = parse_simple_text(node)
-    return normalize_type(name)
+    return sys.intern(normalize_type(name))
+
+
+# Child holding the name of a <param>, for each kind of object with parameters.
+_PARAMETER_NAME_PATHS = {
+    ObjectKind.FUNCTION: _XPATH_DECLNAME,
+    ObjectKind.DEFINE: _XPATH_DEFNAME,
+}
 
 
 def parse_parameters(
-    kind: ObjectKind, node: ElementTree.Element
+    kind: ObjectKind, node: etree._Element
 ) -> Optional[List[Parameter]]:
-    name_tag = {
-        ObjectKind.FUNCTION: "declname",
-        ObjectKind.DEFINE: "defname",
-    }[kind]
+    name_path = _PARAMETER_NAME_PATHS[kind]
 
-    nodes = node.findall("param")
+    nodes = _XPATH_PARAMS(node)
     if kind == ObjectKind.DEFINE and len(nodes) == 0:
         # Differentiate between a define with no parameters and a define with
         # 0 parameters
@@ -432,8 +498,8 @@ def parse_parameters(
     params = []
     for p in nodes:
         param = Parameter(
-            type=parse_type(p.find("type")),
-            name=parse_name(p.find(name_tag)),
+            type=parse_type(_find(_XPATH_TYPE, p)),
+            name=parse_name(_find(name_path, p)),
         )
         if kind == ObjectKind.DEFINE and param.name is None:
             if len(nodes) == 1:
@@ -450,63 +516,79 @@ class DescriptionParser:
     def __init__(
         self, doxygen: "Doxygen", parameters: Optional[List[Parameter]] = None
     ) -> None:
-        self._parameters = parameters
+        self._parameter_types: Dict[Name, Optional[Type]] = {}
+        for p in parameters or []:
+            self._parameter_types.setdefault(p.name, p.type)
         self._text_parser = TextParser(doxygen=doxygen)
 
-    def _parse_text(self, node: ElementTree.Element) -> DescriptionText:
+    def _parse_text(self, node: etree._Element) -> DescriptionText:
         return DescriptionText(contents=self._text_parser.parse(node).strip())
 
-    def _parse_para(self, node: ElementTree.Element) -> DescriptionParagraph:
-        contents = []
+    def _parse_para(self, node: etree._Element) -> DescriptionParagraph:
+        assert node.tag == "para"
 
-        def append(description: Description):
-            """
-            Append the new section & merge in to previous one if applicable.
-            """
-            if description.kind == DescriptionKind.TEXT:
-                description.contents = description.contents.strip()
-                if not description.contents:
-                    return
+        # Raw text and parsed sections of the paragraph, in document order.
+        items: List[Description | str] = []
 
-            if len(contents) == 0:
-                contents.append(description)
-                return
+        if node.text:
+            items.append(node.text)
+
+        # Bound once, since this loop runs for every child of every paragraph.
+        handlers = self._HANDLERS
+        parse_text = self._text_parser.parse
+        append = items.append
+
+        for child in node:
+            handler = handlers.get(child.tag)
+            if handler is not None:
+                append(handler(self, child))
+                tail = child.tail
+                if tail:
+                    append(tail)
+            else:
+                # Inline markup joins the surrounding run of text, so take its
+                # text, tail included, without wrapping it in a section.
+                append(parse_text(child))
 
-            if (
-                description.kind == DescriptionKind.TEXT
-                and contents[-1].kind == DescriptionKind.TEXT
-            ):
-                contents[-1].contents += " "
-                contents[-1].contents += description.contents
-                return
+        if node.tail:
+            items.append(node.tail)
 
+        contents = []
+        # Run of consecutive text, joined into a single section once the run
+        # ends rather than being concatenated piece by piece.
+        text = []
+
+        for item in items:
+            if type(item) is str:
+                item = item.strip()
+                if item:
+                    text.append(item)
+                continue
+
+            if text:
+                contents.append(DescriptionText(contents=" ".join(text)))
+                text.clear()
+
+            # Merge consecutive lists with the same title, e.g. @pre @pre.
             if (
-                description.kind == DescriptionKind.LIST
-                and contents[-1].kind == DescriptionKind.LIST
-                and description.title is not None
-                and contents[-1].title == description.title
+                len(contents) != 0
+                and type(item) is DescriptionList
+                and type(contents[-1]) is DescriptionList
+                and item.title is not None
+                and contents[-1].title == item.title
             ):
-                contents[-1].contents += description.contents
-                return
-
-            contents.append(description)
-
-        assert node.tag == "para"
-
-        if node.text:
-            append(DescriptionText(contents=node.text))
-
-        for child in list(node):
-            append(self.parse(child))
-            if contents[-1].kind != DescriptionKind.TEXT and child.tail:
-                append(DescriptionText(contents=child.tail))
+                contents[-1] = DescriptionList(
+                    title=item.title, contents=contents[-1].contents + item.contents
+                )
+            else:
+                contents.append(item)
 
-        if node.tail:
-            append(DescriptionText(contents=node.tail))
+        if text:
+            contents.append(DescriptionText(contents=" ".join(text)))
 
         return DescriptionParagraph(contents=contents)
 
-    def parse_para(self, nodes: List[ElementTree.Element]) -> DescriptionParagraph:
+    def parse_para(self, nodes: List[etree._Element]) -> DescriptionParagraph:
         paragraphs = []
         for node in nodes:
             paragraphs.append(self._parse_para(node))
@@ -514,25 +596,25 @@ class DescriptionParser:
             return paragraphs[0]
         return DescriptionParagraph(contents=paragraphs)
 
-    def _parse_list(self, node: ElementTree.Element) -> DescriptionList:
+    def _parse_list(self, node: etree._Element) -> DescriptionList:
         assert node.tag == "itemizedlist"
 
         contents = []
 
-        for child in list(node):
+        for child in node:
             if child.tag != "listitem":
                 raise ValueError("Only <listitem> allowed in <itemizedlist>")
-            contents.append(self.parse_para(child.findall("para")))
+            contents.append(self.parse_para(_XPATH_PARAS(child)))
 
         return DescriptionList(title=None, contents=contents)
 
-    def _parse_simplesect(self, node: ElementTree.Element) -> Description:
+    def _parse_simplesect(self, node: etree._Element) -> Description:
         if node.text:
             raise ValueError("Unexpected text in <simplesect>")
 
         kind = some(node.get("kind"))
 
-        contents = self.parse_para(node.findall("para"))
+        contents = self.parse_para(_XPATH_PARAS(node))
 
         if kind == "return":
             return DescriptionReturn(title="Returns", description=contents)
@@ -549,21 +631,16 @@ class DescriptionParser:
             raise ValueError(f"Unexpected kind '{kind}' in Doxygen XML")
 
     def _get_param_type(self, name: Name) -> Optional[Type]:
-        if self._parameters is None:
-            return None
-        for p in self._parameters:
-            if p.name == name:
-                return p.type
-        return None
+        return self._parameter_types.get(name)
 
-    def _parse_parameterlist(self, node: ElementTree.Element) -> DescriptionList:
+    def _parse_parameterlist(self, node: etree._Element) -> DescriptionList:
         if node.text:
             raise ValueError("Unexpected text in <parameterlist>")
 
         params = []
 
-        for node in node.findall("parameteritem"):
-            names = node.findall("parameternamelist/parametername")
+        for node in _XPATH_PARAMETERITEMS(node):
+            names = _XPATH_PARAMETERNAMES(node)
             if len(names) != 1:
                 raise ValueError(f"Expected exactly one parameter name, got {names}")
             name = some(parse_name(names[0]))
@@ -573,7 +650,7 @@ class DescriptionParser:
                     type=self._get_param_type(name),
                     name=name,
                     description=self.parse_para(
-                        node.findall("parameterdescription/para")
+                        _XPATH_PARAMETERDESCRIPTION_PARAS(node)
                     ),
                     direction=parse_direction(names[0]),
                 )
@@ -584,61 +661,83 @@ class DescriptionParser:
             contents=params,
         )
 
-    def parse(self, node: ElementTree.Element) -> Description:
-        if node.tag == "para":
-            return self.parse_para()
-        elif node.tag == "simplesect":
-            return self._parse_simplesect(node)
-        elif node.tag == "parameterlist":
-            return self._parse_parameterlist(node)
-        elif node.tag == "itemizedlist":
-            return self._parse_list(node)
-        else:
+    # Tags that parse into their own description section. Anything else is
+    # inline markup, handled by the TextParser.
+    _HANDLERS: ClassVar[Dict[str, Callable[..., Description]]] = {
+        "para": _parse_para,
+        "simplesect": _parse_simplesect,
+        "parameterlist": _parse_parameterlist,
+        "itemizedlist": _parse_list,
+    }
+
+    def parse(self, node: etree._Element) -> Description:
+        handler = self._HANDLERS.get(node.tag)
+        if handler is None:
             return self._parse_text(node)
+        return handler(self, node)
 
 
-def parse_direction(node: ElementTree.Element) -> Optional[ParameterDirection]:
+_PARAMETER_DIRECTIONS = {
+    "in": ParameterDirection.IN,
+    "out": ParameterDirection.OUT,
+    "inout": ParameterDirection.INOUT,
+}
+
+
+def parse_direction(node: etree._Element) -> Optional[ParameterDirection]:
     direction = node.get("direction")
     if direction is None:
         return None
-    if direction == "in":
-        return ParameterDirection.IN
-    elif direction == "out":
-        return ParameterDirection.OUT
-    elif direction == "inout":
-        return ParameterDirection.INOUT
-    else:
+    if direction not in _PARAMETER_DIRECTIONS:
         raise ValueError(f"Invalid direction '{direction}'")
+    return _PARAMETER_DIRECTIONS[direction]
 
 
-def parse_location(node: ElementTree.Element) -> Optional[Location]:
-    location = node.find("location")
+def parse_location(node: etree._Element) -> Optional[Location]:
+    location = _find(_XPATH_LOCATION, node)
     if location is None:
         return None
     return Location(
-        file=some(location.get("file")),
+        # Every member of a header shares its file path.
+        file=sys.intern(some(location.get("file"))),
         line=int(location.get("line")),
         column=int(location.get("column")),
     )
 
 
-def parse_initializer(node: ElementTree.Element) -> Optional[str]:
-    initializer = node.find("initializer")
+def parse_initializer(node: etree._Element) -> Optional[str]:
+    initializer = _find(_XPATH_INITIALIZER, node)
     if initializer is not None:
-        return parse_simple_text(initializer)
+        # Enum initializers such as "= 0" repeat across enums.
+        return sys.intern(parse_simple_text(initializer))
     return None
 
 
-def parse_compound_type(node: ElementTree.Element) -> CompoundType:
+_COMPOUND_TYPES = {
+    "struct": CompoundType.STRUCT,
+    "union": CompoundType.UNION,
+    "group": CompoundType.GROUP,
+}
+
+
+def parse_compound_type(node: etree._Element) -> CompoundType:
     kind = node.get("kind")
-    if kind == "struct":
-        return CompoundType.STRUCT
-    elif kind == "union":
-        return CompoundType.UNION
-    elif kind == "group":
-        return CompoundType.GROUP
-    else:
+    if kind not in _COMPOUND_TYPES:
         raise ValueError(f"Unsupported compound type '{kind}' in Doxygen XML")
+    return _COMPOUND_TYPES[kind]
+
+
+def _doxyfile_quote(values: Sequence[Union[str, Path]]) -> str:
+    """
+    Formats a Doxyfile list value, quoting each entry so that paths with
+    spaces are kept whole. Doxygen reads \\" as a literal quote inside a
+    quoted value.
+    """
+    return " ".join('"{}"'.format(str(value).replace('"', '\\"')) for value in values)
+
+
+# Number of compound trees kept around for member lookups.
+_MAX_CACHED_MEMBERDEF_COMPOUNDS = 16
 
 
 class Doxygen:
@@ -651,11 +750,7 @@ class Doxygen:
     ) -> None:
         self._doxyxml_dir = os.path.abspath(xml_output)
         os.makedirs(self._doxyxml_dir, exist_ok=True)
-        # Run doxygen.
-        cmd = ["doxygen", "-"]
-        p = Popen(cmd, cwd=source_directory, stdin=PIPE, stdout=PIPE, stderr=STDOUT)
-        out, _ = p.communicate(
-            input=r"""
+        config = r"""
             PROJECT_NAME         = zstd
             GENERATE_XML         = YES
             GENERATE_LATEX       = NO
@@ -663,33 +758,125 @@ class Doxygen:
             INCLUDE_PATH         = {0}
             INPUT                = {1}
             XML_OUTPUT           = {2}
+            XML_PROGRAMLISTING   = NO
+            SOURCE_BROWSER       = NO
+            INLINE_SOURCES       = NO
+            REFERENCED_BY_RELATION = NO
+            REFERENCES_RELATION  = NO
+            HAVE_DOT             = NO
+            INCLUDE_GRAPH        = NO
+            INCLUDED_BY_GRAPH    = NO
             EXTRACT_ALL          = YES
             QUIET                = NO
+            NUM_PROC_THREADS     = 0
             AUTOLINK_SUPPORT     = NO
             MACRO_EXPANSION      = YES
             SKIP_FUNCTION_MACROS = NO
             PREDEFINED           = {3}
             """.format(
-                source_directory,
-                " ".join(sources),
-                self._doxyxml_dir,
-                " ".join([f'"{p}"' for p in predefined]),
-            ).encode("utf-8")
+            _doxyfile_quote([source_directory]),
+            _doxyfile_quote(sources),
+            _doxyfile_quote([self._doxyxml_dir]),
+            _doxyfile_quote(predefined),
+        )
+
+        # Run doxygen. Its output goes straight to a log file, rather than
+        # through a pipe that we would have to drain and then throw away.
+        log_path = os.path.join(self._doxyxml_dir, "doxygen.log")
+        with open(log_path, "wb") as log:
+            run(
+                ["doxygen", "-"],
+                cwd=source_directory,
+                input=config.encode("utf-8"),
+                stdout=log,
+                stderr=STDOUT,
+                check=True,
+            )
+
+        # Lookup tables built from index.xml, so that resolving an identifier
+        # is a dict access rather than a scan of the whole index.
+        self._compound_refids: Dict[Name, List[str]] = {}
+        self._member_refids: Dict[Name, List[str]] = {}
+        self._qualified_member_refids: Dict[Tuple[Name, Name], List[str]] = {}
+        self._ref_names: Dict[Tuple[str, str], Name] = {}
+        # Malformed references in the index only fail when they are looked up,
+        # so one bad entry does not stop the rest of the project from loading.
+        self._bad_ref_names: Dict[Tuple[str, str], str] = {}
+        self._load_index(os.path.join(self._doxyxml_dir, "index.xml"))
+
+        # Memberdefs of the most recently used compounds, by name, for member
+        # lookups. The trees behind them are far larger than the parsed
+        # members, which are cached below, so only a few are kept.
+        self._memberdefs: OrderedDict[str, Dict[Name, List[etree._Element]]] = (
+            OrderedDict()
         )
-        if p.returncode != 0:
-            raise CalledProcessError(p.returncode, cmd)
 
-        with open(os.path.join(self._doxyxml_dir, "index.xml")) as f:
-            self._index = ElementTree.parse(f)
+        # Parsed objects, so that each compound and member is only parsed once
+        # no matter how many identifiers refer to it.
+        self._compounds: Dict[str, Compound] = {}
+        self._members: Dict[str, DoxygenObject] = {}
+        self._collected: Dict[str, DoxygenObject] = {}
+
+    def _add_ref_name(self, kindref: str, refid: str, node: etree._Element) -> None:
+        key = (kindref, refid)
+        if len(node) != 0:
+            self._bad_ref_names.setdefault(
+                key,
+                f"Unexpected children in {kindref} reference {refid} in Doxygen XML",
+            )
+            return
+        name = self._ref_names.setdefault(key, node.text)
+        if name != node.text:
+            self._bad_ref_names.setdefault(
+                key, f"{kindref} {refid} has two names: '{name}' and '{node.text}'"
+            )
 
-        self._compound_xml = {}
+    def _load_index(self, index_path: str) -> None:
+        member_refids = self._member_refids
+        qualified_member_refids = self._qualified_member_refids
+
+        for _, compound in etree.iterparse(
+            index_path,
+            events=("end",),
+            tag="compound",
+            huge_tree=True,
+            collect_ids=False,
+        ):
+            # Entries without a refid or a name cannot be looked up, so they are
+            # skipped rather than failing the whole index.
+            compound_refid = compound.get("refid")
+            compound_name = _find(_XPATH_NAME, compound)
+            compound_text = None
+            if compound_refid is not None and compound_name is not None:
+                compound_text = compound_name.text
+                self._compound_refids.setdefault(compound_text, []).append(
+                    compound_refid
+                )
+                self._add_ref_name("compound", compound_refid, compound_name)
+
+            for member in _XPATH_MEMBERS(compound):
+                member_refid = member.get("refid")
+                member_name = _find(_XPATH_NAME, member)
+                if member_refid is None or member_name is None:
+                    continue
+                # lxml builds a new string on every .text access.
+                member_text = member_name.text
+                member_refids.setdefault(member_text, []).append(member_refid)
+                if compound_text is not None:
+                    qualified_member_refids.setdefault(
+                        (compound_text, member_text), []
+                    ).append(member_refid)
+                self._add_ref_name("member", member_refid, member_name)
+
+            # Only the lookup tables are kept, so free the parsed compound.
+            compound.clear()
+            while compound.getprevious() is not None:
+                del compound.getparent()[0]
 
     def _parse_description(
-        self, node: ElementTree.Element, parameters: Optional[List[Parameter]] = None
+        self, node: etree._Element, parameters: Optional[List[Parameter]] = None
     ) -> Description:
-        nodes = node.findall("briefdescription/para") + node.findall(
-            "detaileddescription/para"
-        )
+        nodes = _XPATH_DESCRIPTION_PARAS(node)
 
         if len(nodes) == 0:
             return None
@@ -697,107 +884,151 @@ class Doxygen:
         parser = DescriptionParser(self, parameters)
         return parser.parse_para(nodes)
 
-    def _parse_function(self, node: ElementTree.Element) -> Function:
+    def _parse_function(self, node: etree._Element) -> Function:
         parameters = parse_parameters(ObjectKind.FUNCTION, node)
         return Function(
-            type=some(parse_type(node.find("type"))),
-            name=some(parse_name(node.find("name"))),
+            type=some(parse_type(_find(_XPATH_TYPE, node))),
+            name=some(parse_name(_find(_XPATH_NAME, node))),
             parameters=parameters,
             description=self._parse_description(node, parameters),
             location=some(parse_location(node)),
         )
 
-    def _parse_define(self, node: ElementTree.Element) -> Define:
+    def _parse_define(self, node: etree._Element) -> Define:
         return Define(
-            name=some(parse_name(node.find("name"))),
+            name=some(parse_name(_find(_XPATH_NAME, node))),
             parameters=parse_parameters(ObjectKind.DEFINE, node),
             initializer=parse_initializer(node),
             description=self._parse_description(node, []),
             location=some(parse_location(node)),
         )
 
-    def _parse_enum_values(self, node: ElementTree.Element) -> List[EnumValue]:
+    def _parse_enum_values(self, node: etree._Element) -> List[EnumValue]:
         values = []
-        for v in node.findall("enumvalue"):
+        for v in _XPATH_ENUMVALUES(node):
             values.append(
                 EnumValue(
-                    name=some(parse_name(v.find("name"))),
+                    name=some(parse_name(_find(_XPATH_NAME, v))),
                     initializer=parse_initializer(v),
                     description=self._parse_description(v, []),
                 )
             )
         return values
 
-    def _parse_enum(self, node: ElementTree.Element) -> Enum:
+    def _parse_enum(self, node: etree._Element) -> Enum:
         return Enum(
-            name=some(parse_name(node.find("name"))),
+            name=some(parse_name(_find(_XPATH_NAME, node))),
             description=self._parse_description(node, []),
             location=some(parse_location(node)),
             values=self._parse_enum_values(node),
         )
 
-    def _parse_variable(self, node: ElementTree.Element) -> Variable:
-        name = some(parse_name(node.find("name")))
+    def _parse_variable(self, node: etree._Element) -> Variable:
+        name = some(parse_name(_find(_XPATH_NAME, node)))
         return Variable(
-            type=some(parse_type(node.find("type"))),
+            type=some(parse_type(_find(_XPATH_TYPE, node))),
             name=name,
-            qualified_name=parse_name(node.find("qualifiedname")) or name,
+            qualified_name=parse_name(_find(_XPATH_QUALIFIEDNAME, node)) or name,
             initializer=parse_initializer(node),
             description=self._parse_description(node, []),
             location=some(parse_location(node)),
         )
 
-    def _parse_typedef(self, node: ElementTree.Element) -> Typedef:
+    def _parse_typedef(self, node: etree._Element) -> Typedef:
         return Typedef(
-            type=some(parse_type(node.find("type"))),
-            name=some(parse_name(node.find("name"))),
-            definition=parse_simple_text(node.find("definition")),
+            type=some(parse_type(_find(_XPATH_TYPE, node))),
+            name=some(parse_name(_find(_XPATH_NAME, node))),
+            definition=parse_simple_text(_find(_XPATH_DEFINITION, node)),
             description=self._parse_description(node, []),
             location=some(parse_location(node)),
         )
 
-    def _parse_member(self, node: ElementTree.Element) -> DoxygenObject:
+    def _parse_member(self, node: etree._Element) -> DoxygenObject:
+        refid = node.get("id")
+        if refid is None:
+            raise ValueError("Missing id of <memberdef> in Doxygen XML")
+        if refid not in self._members:
+            self._members[refid] = self._parse_member_kind(node)
+        return self._members[refid]
+
+    # Parser for each supported memberdef kind.
+    _MEMBER_PARSERS: ClassVar[Dict[str, Callable[..., DoxygenObject]]] = {
+        "function": _parse_function,
+        "define": _parse_define,
+        "enum": _parse_enum,
+        "variable": _parse_variable,
+        "typedef": _parse_typedef,
+    }
+
+    def _parse_member_kind(self, node: etree._Element) -> DoxygenObject:
         kind = node.get("kind")
-        if kind == "function":
-            return self._parse_function(node)
-        elif kind == "define":
-            return self._parse_define(node)
-        elif kind == "enum":
-            return self._parse_enum(node)
-        elif kind == "variable":
-            return self._parse_variable(node)
-        elif kind == "typedef":
-            return self._parse_typedef(node)
-        else:
+        parser = self._MEMBER_PARSERS.get(kind)
+        if parser is None:
             raise ValueError(f"Unsupported kind '{kind}' in Doxygen XML")
+        return parser(self, node)
+
+    def _compound_path(self, refid: str) -> str:
+        return os.path.join(self._doxyxml_dir, f"{refid}.xml")
+
+    def _load_memberdefs(self, refid: str) -> Dict[Name, List[etree._Element]]:
+        if refid in self._memberdefs:
+            self._memberdefs.move_to_end(refid)
+            return self._memberdefs[refid]
+
+        # Read the whole file with a single read and parse it from memory,
+        # rather than having libxml2 pull it in through small buffered reads.
+        xml_path = self._compound_path(refid)
+        with open(xml_path, "rb") as f:
+            data = f.read()
+        xml = etree.fromstring(data, parser=_XML_PARSER, base_url=xml_path)
+
+        memberdefs = {}
+        for memberdef in _XPATH_MEMBERDEFS(xml):
+            name = _find(_XPATH_NAME, memberdef)
+            if name is not None:
+                memberdefs.setdefault(name.text, []).append(memberdef)
+
+        self._memberdefs[refid] = memberdefs
+        if len(self._memberdefs) > _MAX_CACHED_MEMBERDEF_COMPOUNDS:
+            self._memberdefs.popitem(last=False)
+        return memberdefs
+
+    def _parse_compound(self, refid: str) -> Compound:
+        """
+        Streams the compound's XML, parsing each member as soon as it has been
+        read and then dropping it, so the whole tree is never held in memory.
+        """
+        node = None
+        refids = []
+        members = []
+        for _, element in etree.iterparse(
+            self._compound_path(refid),
+            events=("end",),
+            tag=("compounddef", "innerclass", "memberdef"),
+            huge_tree=True,
+            collect_ids=False,
+        ):
+            if element.tag == "innerclass":
+                refids.append(some(element.get("refid")))
+            elif element.tag == "memberdef":
+                members.append(self._parse_member(element))
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+            else:
+                node = element
+                break
 
-    def _load_compound(self, refid: str) -> ElementTree.Element:
-        if refid in self._compound_xml:
-            return self._compound_xml[refid]
-
-        xml_path = os.path.join(self._doxyxml_dir, f"{refid}.xml")
-        with open(xml_path) as f:
-            self._compound_xml[refid] = ElementTree.parse(f)
-        return self._compound_xml[refid]
-
-    def _parse_compound(self, node: ElementTree.Element) -> Compound:
-        node = some(node.find("compounddef"))
-        name = some(parse_name(node.find("compoundname")))
-        title = node.find("title")
+        node = some(node)
+        name = some(parse_name(_find(_XPATH_COMPOUNDNAME, node)))
+        title = _find(_XPATH_TITLE, node)
         if title is not None:
             title = parse_simple_text(title)
         else:
             title = name
 
-        members = []
-
-        for compound in node.findall("innerclass"):
-            refid = some(compound.get("refid"))
-            inner = self._parse_compound(self._load_compound(refid))
-            members.append(inner)
-
-        for member in node.findall("sectiondef/memberdef"):
-            members.append(self._parse_member(member))
+        # Inner classes are listed before the members.
+        members = [self._get_compound(refid) for refid in refids] + members
 
         return Compound(
             type=parse_compound_type(node),
@@ -808,39 +1039,36 @@ class Doxygen:
             location=parse_location(node),
         )
 
+    def _get_compound(self, refid: str) -> Compound:
+        if refid not in self._compounds:
+            self._compounds[refid] = self._parse_compound(refid)
+        return self._compounds[refid]
+
     def _collect_compound(self, name: str) -> Optional[Compound]:
-        nodes = self._index.findall(f"compound/name[.='{name}']/..")
-        if len(nodes) == 0:
+        refids = self._compound_refids.get(name, [])
+        if len(refids) == 0:
             return None
-        if len(nodes) > 1:
+        if len(refids) > 1:
             raise ValueError(f"Ambiguous compound name '{name}' in Doxygen XML")
-        node = nodes[0]
-        refid = some(node.get("refid"))
-        node = self._load_compound(refid)
+        return self._get_compound(refids[0])
 
-        return self._parse_compound(node)
-
-    def _load_member_node(self, name: str) -> Optional[ElementTree.Element]:
+    def _load_member_node(self, name: str) -> Optional[etree._Element]:
         if "::" in name:
             compound, name = name.split("::")
-            nodes = self._index.findall(
-                f"compound/name[.='{compound}']/../member/name[.='{name}']/.."
-            )
+            refids = self._qualified_member_refids.get((compound, name), [])
         else:
-            nodes = self._index.findall(f"compound/member/name[.='{name}']/..")
+            refids = self._member_refids.get(name, [])
 
-        if len(nodes) == 0:
+        if len(refids) == 0:
             return None
 
-        refid = some(nodes[0].get("refid"))
+        refid = refids[0]
         pos = refid.rfind("_")
         if pos == -1:
             raise ValueError(f"Invalid refid '{refid}' in Doxygen XML")
         refid = refid[:pos]
 
-        nodes = self._load_compound(refid).findall(
-            f"compounddef/sectiondef/memberdef/name[.='{name}']/.."
-        )
+        nodes = self._load_memberdefs(refid).get(name, [])
         assert len(nodes) > 0
         if len(nodes) > 1:
             raise ValueError(f"Ambiguous name '{name}' in Doxygen XML")
@@ -854,6 +1082,11 @@ class Doxygen:
         return self._parse_member(node)
 
     def collect(self, identifier: str) -> DoxygenObject:
+        if identifier not in self._collected:
+            self._collected[identifier] = self._collect(identifier)
+        return self._collected[identifier]
+
+    def _collect(self, identifier: str) -> DoxygenObject:
         obj = self._collect_member(identifier)
         if obj is not None:
             return obj
@@ -864,7 +1097,7 @@ class Doxygen:
 
         raise ValueError(f"Unknown identifier '{identifier}'")
 
-    def find_qualified_name(self, ref: ElementTree.Element) -> Name:
+    def find_qualified_name(self, ref: etree._Element) -> Name:
         assert ref.tag == "ref"
 
         refid = ref.get("refid")
@@ -874,21 +1107,9 @@ class Doxygen:
         if kindref is None:
             raise ValueError("Missing kindref in Doxygen XML")
 
-        nodes = self._index.findall(f".//{kindref}[@refid='{refid}']/name")
-        if len(nodes) == 0:
-            print(f"{kindref}[@refid='{refid}']/name")
+        if (kindref, refid) in self._bad_ref_names:
+            raise ValueError(self._bad_ref_names[(kindref, refid)])
+        if (kindref, refid) not in self._ref_names:
             raise ValueError(f"Unknown {kindref} reference {refid} in Doxygen XML")
 
-        name = nodes[0].text
-
-        for node in nodes:
-            if node.text != name:
-                raise ValueError(
-                    f"{kindref} {refid} has two names: '{name}' and '{node.text}'"
-                )
-            if len(list(node)) != 0:
-                raise ValueError(
-                    f"Unexpected children in {kindref} reference {refid} in Doxygen XML"
-                )
-
-        return name
+        return self._ref_names[(kindref, refid)]
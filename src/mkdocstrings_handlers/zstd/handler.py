@@ -3,7 +3,6 @@ from pathlib import Path
 from typing import Any, List, Tuple, Mapping, Optional, ClassVar
 from .doxygen import Doxygen, DoxygenObject
 from .rendering import do_format, AutorefsHook
-from collections import ChainMap
 
 from mkdocstrings.handlers.base import BaseHandler
 from markdown import Markdown
@@ -80,7 +79,8 @@ class ZstdHandler(BaseHandler):
         self.env.globals["AutorefsHook"] = AutorefsHook
 
     def render(self, obj: DoxygenObject, config: dict) -> str:
-        final_config = ChainMap(config, self.config, self.default_config)
+        # Flatten once so each template option lookup is a single dict probe.
+        final_config = {**self.default_config, **self.config, **config}
 
         template_name = f"{obj.kind}.html.jinja"
         template = self.env.get_template(template_name)
@@ -1,10 +1,14 @@
+from functools import lru_cache
 from typing import Any, Mapping, Optional
 from mkdocs_autorefs.references import AutorefsHookInterface
 from .doxygen import DoxygenObject
-from subprocess import PIPE, STDOUT, CalledProcessError, Popen
+from subprocess import PIPE, STDOUT, run
 from pathlib import Path
 
 
+# The same declarations are formatted again for every page that references
+# them, and on every rebuild under `mkdocs serve`.
+@lru_cache(maxsize=4096)
 def _clang_format(
     code: str, root_directory: Path, line_length: int, based_on_style
 ) -> str:
@@ -24,17 +28,16 @@ def _clang_format(
         "--style",
         f"{{BasedOnStyle: {based_on_style}, ColumnLimit: {line_length}}}",
     ]
-    process = Popen(
+    process = run(
         cmd,
         cwd=root_directory,
-        stdin=PIPE,
+        input=code,
         stdout=PIPE,
         stderr=STDOUT,
+        encoding="utf-8",
+        check=True,
     )
-    stdout, _ = process.communicate(input=code.encode())
-    if process.returncode != 0:
-        raise CalledProcessError(process.returncode, cmd)
-    return stdout.decode().strip()
+    return process.stdout.strip()
 
 
 def do_format(code: str, config: Mapping[str, Any]) -> str:
@@ -66,6 +69,7 @@ class AutorefsHook(AutorefsHookInterface):
         """The current object being rendered."""
         self.config = config
         """The configuration options."""
+        self._context: Optional[AutorefsHookInterface.Context] = None
 
     def expand_identifier(self, identifier: str) -> str:
         """Expand an identifier.
@@ -81,9 +85,15 @@ class AutorefsHook(AutorefsHookInterface):
     def get_context(self) -> AutorefsHookInterface.Context:
         """Get the context for the current object.
 
+        The context only depends on the current object, so it is built once
+        and reused for every cross-reference in it.
+
         Returns:
             The context.
         """
+        if self._context is not None:
+            return self._context
+
         role = self.current_object.role
         origin = self.current_object.qualified_name
 
@@ -94,10 +104,11 @@ class AutorefsHook(AutorefsHookInterface):
             filepath = ""
             lineno = 0
 
-        return AutorefsHookInterface.Context(
+        self._context = AutorefsHookInterface.Context(
             domain="c",
             role=role,
             origin=origin,
             filepath=filepath,
             lineno=lineno,
         )
+        return self._context
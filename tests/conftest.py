@@ -1,5 +1,3 @@
-from pathlib import Path
-
 import pytest
 from markdown.core import Markdown
 from mkdocs.config.defaults import MkDocsConfig
@@ -11,36 +9,43 @@ from mkdocstrings_handlers.zstd.handler import ZstdHandler
 
 from . import helpers
 
+# The fixtures below only read the generated documentation, so they are shared
+# by the whole session rather than running doxygen again for every test.
+
 
-@pytest.fixture(name="doxygen")
-def fixture_doxygen(tmp_path: Path) -> Doxygen:
+@pytest.fixture(name="doxygen", scope="session")
+def fixture_doxygen(tmp_path_factory: pytest.TempPathFactory) -> Doxygen:
     """Return a Doxygen instance.
 
+    Parameters:
+        tmp_path_factory: Pytest fixture.
+
     Returns:
-        A Dandler instance.
+        A Doxygen instance.
     """
 
-    return helpers.doxygen(tmp_path)
+    return helpers.doxygen(tmp_path_factory.mktemp("doxygen"))
 
 
-@pytest.fixture(name="mkdocs_conf")
+@pytest.fixture(name="mkdocs_conf", scope="session")
 def fixture_mkdocs_conf(
-    request: pytest.FixtureRequest, tmp_path: Path
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
 ) -> Iterator[MkDocsConfig]:
     """Yield a MkDocs configuration object.
 
     Parameters:
         request: Pytest fixture.
-        tmp_path: Pytest fixture.
+        tmp_path_factory: Pytest fixture.
 
     Yields:
         MkDocs config.
     """
+    tmp_path = tmp_path_factory.mktemp("mkdocs")
     with helpers.mkdocs_conf(request, tmp_path) as mkdocs_conf:
         yield mkdocs_conf
 
 
-@pytest.fixture(name="plugin")
+@pytest.fixture(name="plugin", scope="session")
 def fixture_plugin(mkdocs_conf: MkDocsConfig) -> MkdocstringsPlugin:
     """Return a plugin instance.
 
@@ -53,7 +58,7 @@ def fixture_plugin(mkdocs_conf: MkDocsConfig) -> MkdocstringsPlugin:
     return helpers.plugin(mkdocs_conf)
 
 
-@pytest.fixture(name="ext_markdown")
+@pytest.fixture(name="ext_markdown", scope="session")
 def fixture_ext_markdown(mkdocs_conf: MkDocsConfig) -> Markdown:
     """Return a Markdown instance with MkdocstringsExtension.
 
@@ -66,8 +71,12 @@ def fixture_ext_markdown(mkdocs_conf: MkDocsConfig) -> Markdown:
     return helpers.ext_markdown(mkdocs_conf)
 
 
-@pytest.fixture(name="handler")
-def fixture_handler(plugin: MkdocstringsPlugin, ext_markdown: Markdown, tmp_path: Path) -> ZstdHandler:
+@pytest.fixture(name="handler", scope="session")
+def fixture_handler(
+    plugin: MkdocstringsPlugin,
+    ext_markdown: Markdown,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> ZstdHandler:
     """Return a handler instance.
 
     Parameters:
@@ -76,4 +85,4 @@ def fixture_handler(plugin: MkdocstringsPlugin, ext_markdown: Markdown, tmp_path
     Returns:
         A handler instance.
     """
-    return helpers.handler(plugin, ext_markdown, tmp_path)
+    return helpers.handler(plugin, ext_markdown, tmp_path_factory.mktemp("handler"))
@@ -1,3 +1,9 @@
+from pathlib import Path
+
+import pytest
+from lxml import etree
+
+from mkdocstrings_handlers.zstd import doxygen as doxygen_module
 from mkdocstrings_handlers.zstd.doxygen import (
     CompoundType,
     DescriptionKind,
@@ -9,97 +15,46 @@ from mkdocstrings_handlers.zstd.doxygen import (
     DescriptionReturn,
     DescriptionParameter,
     DescriptionList,
+    DescriptionParser,
+    TextParser,
+    normalize_type,
+    _doxyfile_quote,
 )
 
+from . import helpers
+
 
-def test_doxygen_file1(doxygen):
-    macro1 = doxygen.collect("MACRO1")
-    assert macro1.kind == ObjectKind.DEFINE
-    assert macro1.name == "MACRO1"
-    assert macro1.initializer == "x"
-    assert len(macro1.parameters) == 1
-    assert macro1.parameters[0].type is None
-    assert macro1.parameters[0].name == "x"
-
-    func1 = doxygen.collect("func1")
-    assert func1.kind == ObjectKind.FUNCTION
-    assert func1.name == "func1"
-    assert len(func1.parameters) == 2
-    assert func1.parameters[0].type == "struct1*"
-    assert func1.parameters[0].name == "s"
-    assert func1.parameters[1].type == "int"
-    assert func1.parameters[1].name == "x"
-
-    enum1 = doxygen.collect("enum1")
-    assert enum1.kind == ObjectKind.ENUM
-    assert enum1.name == "enum1"
-    assert len(enum1.values) == 4
-    assert enum1.values[0].name == "enum1_value1"
-    assert enum1.values[0].initializer == "= 0"
-    assert enum1.values[1].name == "enum1_value2"
-    assert enum1.values[1].initializer is None
-    assert enum1.values[3].name == "enum1_value5"
-    assert enum1.values[3].initializer == "= 5"
-
-
-def test_doxygen_file2(doxygen):
-    macro2 = doxygen.collect("MACRO2")
-    assert macro2.kind == ObjectKind.DEFINE
-    assert macro2.name == "MACRO2"
-    assert macro2.initializer == "MACRO3(x)"
-    assert len(macro2.parameters) == 1
-    assert macro2.parameters[0].type is None
-    assert macro2.parameters[0].name == "x"
-
-    func2 = doxygen.collect("func2")
-    assert func2.kind == ObjectKind.FUNCTION
-    assert func2.name == "func2"
-    assert len(func2.parameters) == 2
-    assert func2.parameters[0].type == "struct2*"
-    assert func2.parameters[0].name == "s"
-    assert func2.parameters[1].type == "int"
-    assert func2.parameters[1].name == "x"
-
-    enum2 = doxygen.collect("enum2")
-    assert enum2.kind == ObjectKind.ENUM
-    assert enum2.name == "enum2"
-    assert len(enum2.values) == 4
-    assert enum2.values[0].name == "enum2_value1"
-    assert enum2.values[0].initializer == "= 0"
-    assert enum2.values[1].name == "enum2_value2"
-    assert enum2.values[1].initializer is None
-    assert enum2.values[3].name == "enum2_value5"
-    assert enum2.values[3].initializer == "= 5"
-
-
-def test_doxygen_file3(doxygen):
-    macro3 = doxygen.collect("MACRO3")
-    assert macro3.kind == ObjectKind.DEFINE
-    assert macro3.name == "MACRO3"
-    assert macro3.initializer == "MACRO1(x)"
-    assert len(macro3.parameters) == 1
-    assert macro3.parameters[0].type is None
-    assert macro3.parameters[0].name == "x"
-
-    func3 = doxygen.collect("func3")
-    assert func3.kind == ObjectKind.FUNCTION
-    assert func3.name == "func3"
-    assert len(func3.parameters) == 2
-    assert func3.parameters[0].type == "struct3*"
-    assert func3.parameters[0].name == "s"
-    assert func3.parameters[1].type == "int"
-    assert func3.parameters[1].name == "x"
-
-    enum3 = doxygen.collect("enum3")
-    assert enum3.kind == ObjectKind.ENUM
-    assert enum3.name == "enum3"
-    assert len(enum3.values) == 4
-    assert enum3.values[0].name == "enum3_value1"
-    assert enum3.values[0].initializer == "= 0"
-    assert enum3.values[1].name == "enum3_value2"
-    assert enum3.values[1].initializer is None
-    assert enum3.values[3].name == "enum3_value5"
-    assert enum3.values[3].initializer == "= 5"
+@pytest.mark.parametrize(
+    "n,macro_initializer", [(1, "x"), (2, "MACRO3(x)"), (3, "MACRO1(x)")]
+)
+def test_doxygen_file(doxygen, n, macro_initializer):
+    macro = doxygen.collect(f"MACRO{n}")
+    assert macro.kind == ObjectKind.DEFINE
+    assert macro.name == f"MACRO{n}"
+    assert macro.initializer == macro_initializer
+    assert len(macro.parameters) == 1
+    assert macro.parameters[0].type is None
+    assert macro.parameters[0].name == "x"
+
+    func = doxygen.collect(f"func{n}")
+    assert func.kind == ObjectKind.FUNCTION
+    assert func.name == f"func{n}"
+    assert len(func.parameters) == 2
+    assert func.parameters[0].type == f"struct{n}*"
+    assert func.parameters[0].name == "s"
+    assert func.parameters[1].type == "int"
+    assert func.parameters[1].name == "x"
+
+    enum = doxygen.collect(f"enum{n}")
+    assert enum.kind == ObjectKind.ENUM
+    assert enum.name == f"enum{n}"
+    assert len(enum.values) == 4
+    assert enum.values[0].name == f"enum{n}_value1"
+    assert enum.values[0].initializer == "= 0"
+    assert enum.values[1].name == f"enum{n}_value2"
+    assert enum.values[1].initializer is None
+    assert enum.values[3].name == f"enum{n}_value5"
+    assert enum.values[3].initializer == "= 5"
 
 
 def test_struct(doxygen):
@@ -109,18 +64,11 @@ def test_struct(doxygen):
     assert s.name == "s1"
     assert len(s.members) == 3
 
-    assert s.members[0].kind == ObjectKind.VARIABLE
-    assert s.members[0].type == "int"
-    assert s.members[0].name == "x"
-    assert s.members[0].qualified_name == "s1::x"
-
-    assert s.members[1].kind == ObjectKind.VARIABLE
-    assert s.members[1].type == "enum1"
-    assert s.members[1].name == "e"
-    assert s.members[1].qualified_name == "s1::e"
-
-    assert s.members[2].kind == ObjectKind.VARIABLE
-    assert s.members[2].qualified_name == "s1::y"
+    assert [(m.kind, m.type, m.name, m.qualified_name) for m in s.members] == [
+        (ObjectKind.VARIABLE, "int", "x", "s1::x"),
+        (ObjectKind.VARIABLE, "enum1", "e", "s1::e"),
+        (ObjectKind.VARIABLE, "int", "y", "s1::y"),
+    ]
 
 
 def test_union(doxygen):
@@ -130,15 +78,10 @@ def test_union(doxygen):
     assert u.name == "u1"
     assert len(u.members) == 2
 
-    assert u.members[0].kind == ObjectKind.VARIABLE
-    assert u.members[0].type == "int"
-    assert u.members[0].name == "x"
-    assert u.members[0].qualified_name == "u1::x"
-
-    assert u.members[1].kind == ObjectKind.VARIABLE
-    assert u.members[1].type == "s1"
-    assert u.members[1].name == "s"
-    assert u.members[1].qualified_name == "u1::s"
+    assert [(m.kind, m.type, m.name, m.qualified_name) for m in u.members] == [
+        (ObjectKind.VARIABLE, "int", "x", "u1::x"),
+        (ObjectKind.VARIABLE, "s1", "s", "u1::s"),
+    ]
 
 
 def test_group(doxygen):
@@ -182,8 +125,6 @@ def test_func_in_para_returns(doxygen):
     func = doxygen.collect("func_in_para_returns")
     desc = func.description
 
-    print(desc)
-
     expected = DescriptionParagraph(
         contents=[
             DescriptionText(
@@ -251,7 +192,6 @@ def test_var_list_items(doxygen):
     var = doxygen.collect("var_list_items")
     desc = var.description
 
-    print(desc)
     expected = DescriptionParagraph(
         contents=[
             DescriptionParagraph(
@@ -292,7 +232,6 @@ def test_var_brief(doxygen):
     var = doxygen.collect("var_brief")
     desc = var.description
 
-    print(desc)
     expected = DescriptionParagraph(
         contents=[DescriptionText(contents="brief description")]
     )
@@ -303,7 +242,6 @@ def test_var_brief_and_detailed(doxygen):
     var = doxygen.collect("var_brief_and_detailed")
     desc = var.description
 
-    print(desc)
     expected = DescriptionParagraph(
         contents=[
             DescriptionParagraph(
@@ -321,7 +259,6 @@ def test_var_markups(doxygen):
     var = doxygen.collect("var_markups")
     desc = var.description
 
-    print(desc)
     expected = DescriptionParagraph(
         contents=[
             DescriptionText(
@@ -336,7 +273,6 @@ def test_func_with_param(doxygen):
     func = doxygen.collect("func_with_param")
     desc = func.description
 
-    print(desc)
     expected = DescriptionParagraph(
         contents=[
             DescriptionList(
@@ -361,7 +297,6 @@ def test_func_with_code_block(doxygen):
     func = doxygen.collect("func_with_code_block")
     desc = func.description
 
-    print(desc)
     expected = DescriptionParagraph(
         contents=[
             DescriptionText(
@@ -376,7 +311,6 @@ def test_func_with_refs(doxygen):
     func = doxygen.collect("func_with_refs")
     desc = func.description
 
-    print(desc)
     expected = DescriptionParagraph(
         contents=[
             DescriptionText(
@@ -417,3 +351,129 @@ def test_ptr1(doxygen):
     assert typedef1.definition == "typedef typedef1* ptr1"
     assert typedef1.description.kind == DescriptionKind.PARAGRAPH
     assert len(typedef1.description.contents) == 1
+
+
+def test_qualified_member(doxygen):
+    x = doxygen.collect("s1::x")
+    assert x.kind == ObjectKind.VARIABLE
+    assert x.qualified_name == "s1::x"
+
+    x = doxygen.collect("u1::x")
+    assert x.kind == ObjectKind.VARIABLE
+    assert x.qualified_name == "u1::x"
+
+    s = doxygen.collect("u1::s")
+    assert s.type == "s1"
+
+
+def test_collect_is_cached(doxygen):
+    assert doxygen.collect("func1") is doxygen.collect("func1")
+
+    g = doxygen.collect("g1")
+    assert doxygen.collect("g1_struct") is g.members[0]
+    assert doxygen.collect("G1_MACRO") is g.members[5]
+
+
+def test_memberdef_cache_eviction(tmp_path, monkeypatch):
+    monkeypatch.setattr(doxygen_module, "_MAX_CACHED_MEMBERDEF_COMPOUNDS", 1)
+    doxygen = helpers.doxygen(tmp_path)
+
+    assert doxygen.collect("s1::x").qualified_name == "s1::x"
+    assert list(doxygen._memberdefs) == ["structs1"]
+
+    assert doxygen.collect("u1::x").qualified_name == "u1::x"
+    assert list(doxygen._memberdefs) == ["unionu1"]
+
+    assert doxygen.collect("func1").name == "func1"
+    assert list(doxygen._memberdefs) == ["file1_8h"]
+
+    # Members of evicted compounds are loaded again on demand.
+    e = doxygen.collect("s1::e")
+    assert e.qualified_name == "s1::e"
+    assert e.type == "enum1"
+    assert list(doxygen._memberdefs) == ["structs1"]
+
+    s = doxygen.collect("u1::s")
+    assert s.type == "s1"
+    assert list(doxygen._memberdefs) == ["unionu1"]
+
+
+def test_normalize_type():
+    assert normalize_type("int") == "int"
+    assert normalize_type("struct1 *") == "struct1*"
+    assert normalize_type("const char * const *") == "const char* const*"
+    assert normalize_type("std::vector< int >") == "std::vector<int>"
+    assert normalize_type("std::vector< int * > &") == "std::vector<int*>&"
+    assert normalize_type("int  *") == "int *"
+
+
+def test_description_parser_para():
+    parser = DescriptionParser(None)
+    desc = parser.parse(etree.fromstring("<para>Some <bold>bold</bold> text</para>"))
+    assert desc == DescriptionParagraph(
+        contents=[DescriptionText(contents="Some <b>bold</b> text")]
+    )
+
+
+def test_description_parser_merges_consecutive_lists():
+    parser = DescriptionParser(None)
+    desc = parser.parse(
+        etree.fromstring(
+            "<para>"
+            '<simplesect kind="pre"><para>a</para></simplesect>'
+            '<simplesect kind="pre"><para>b</para></simplesect>'
+            "</para>"
+        )
+    )
+    assert desc == DescriptionParagraph(
+        contents=[
+            DescriptionList(
+                title="Preconditions",
+                contents=[
+                    DescriptionParagraph(contents=[DescriptionText(contents="a")]),
+                    DescriptionParagraph(contents=[DescriptionText(contents="b")]),
+                ],
+            )
+        ]
+    )
+
+
+def test_doxyfile_quote():
+    assert _doxyfile_quote([]) == ""
+    assert _doxyfile_quote(["a.h", Path("dir/b.h")]) == '"a.h" "dir/b.h"'
+    assert _doxyfile_quote([Path("my dir/c.h")]) == '"my dir/c.h"'
+    assert _doxyfile_quote(['say "hi".h']) == r'"say \"hi\".h"'
+
+
+class _StubResolver:
+    def find_qualified_name(self, ref):
+        return "array"
+
+
+def test_text_parser_ref_escapes_brackets():
+    parser = TextParser(_StubResolver())
+    text = parser.parse(etree.fromstring('<ref refid="r1" kindref="member">a[0]</ref>'))
+    assert text == r"[a\[0\]][array]"
+
+
+def test_malformed_index_entries_are_skipped(tmp_path):
+    doxygen = helpers.doxygen(tmp_path / "doxygen")
+    index = tmp_path / "index.xml"
+    index.write_text("""<doxygenindex>
+  <compound kind="file"><name>nameless.h</name>
+    <member refid="bad_1a01" kind="variable"><name>bad<ref>x</ref></name></member>
+    <member kind="variable"><name>no_refid</name></member>
+  </compound>
+  <compound refid="good" kind="file"><name>good.h</name>
+    <member refid="good_1a01" kind="variable"><name>good_var</name></member>
+  </compound>
+</doxygenindex>
+""")
+    doxygen._load_index(str(index))
+
+    ref = etree.fromstring('<ref refid="good_1a01" kindref="member">x</ref>')
+    assert doxygen.find_qualified_name(ref) == "good_var"
+
+    ref = etree.fromstring('<ref refid="bad_1a01" kindref="member">x</ref>')
+    with pytest.raises(ValueError, match="Unexpected children"):
+        doxygen.find_qualified_name(ref)
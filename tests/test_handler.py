@@ -1,14 +1,10 @@
+import pytest
 
 from mkdocstrings_handlers.zstd.handler import ZstdHandler
 
-def symbol_smoke_test(handler: ZstdHandler, name: str):
-    item = handler.collect(name, {})
-    html = handler.render(item, {})
-    assert html
-
-
-def test_handler_smoke(handler: ZstdHandler):
-    symbols = [
+@pytest.mark.parametrize(
+    "symbol",
+    [
         "MACRO1",
         "func1",
         "enum1",
@@ -25,9 +21,12 @@ def test_handler_smoke(handler: ZstdHandler):
         "var_list_items",
         "var_brief",
         "var_brief_and_detailed",
-    ]
-    for symbol in symbols:
-        symbol_smoke_test(handler, symbol)
+    ],
+)
+def test_handler_smoke(handler: ZstdHandler, symbol: str):
+    item = handler.collect(symbol, {})
+    html = handler.render(item, {})
+    assert html
 
 def test_handler_empty_macro(handler: ZstdHandler):
     item = handler.collect("EMPTY_MACRO", {})
@@ -71,43 +70,31 @@ def test_handler_show_description(handler: ZstdHandler):
     html = handler.render(item, {"show_description": False})
     assert "brief description" not in html
 
-def test_handler_show_description_preconditions(handler: ZstdHandler):
+@pytest.fixture(name="func1", scope="module")
+def fixture_func1(handler: ZstdHandler):
     item = handler.collect("func1", {})
-
-    html = handler.render(item, {})
-    assert "Preconditions" in html
-    assert "s != NULL" in html
-    
-    html = handler.render(item, {"show_description_preconditions": False})
-    assert "Preconditions" not in html
-    assert "s != NULL" not in html
-
-def test_handler_show_description_postconditions(handler: ZstdHandler):
-    item = handler.collect("func1", {})
-
-    html = handler.render(item, {})
-    assert "Postconditions" in html
-    assert "s-&gt;x == x" in html
-    
-    html = handler.render(item, {"show_description_postconditions": False})
-    assert "Postconditions" not in html
-    assert "s-&gt;x == x" not in html
-
-def test_handler_show_description_return(handler: ZstdHandler):
-    item = handler.collect("func1", {})
-
-    html = handler.render(item, {})
-    assert "Returns" in html
-    assert ">s-&gt;x<" in html
-    
-    html = handler.render(item, {"show_description_return": False})
-    assert "Returns" not in html
-    assert ">s-&gt;x<" not in html
+    return item, handler.render(item, {})
+
+@pytest.mark.parametrize(
+    "option,title,text",
+    [
+        ("show_description_preconditions", "Preconditions", "s != NULL"),
+        ("show_description_postconditions", "Postconditions", "s-&gt;x == x"),
+        ("show_description_return", "Returns", ">s-&gt;x<"),
+    ],
+)
+def test_handler_show_description_section(handler: ZstdHandler, func1, option, title, text):
+    item, html = func1
+    assert title in html
+    assert text in html
+
+    html = handler.render(item, {option: False})
+    assert title not in html
+    assert text not in html
 
 def test_handler_func_with_param(handler: ZstdHandler):
     item = handler.collect("func_with_param", {})
     html = handler.render(item, {})
-    print(html)
     pos = html.find('<div class="doc-md-description">')
     assert pos != -1
     html = html[pos:]
@@ -116,13 +103,11 @@ def test_handler_func_with_param(handler: ZstdHandler):
 def test_handler_func_with_code_block(handler: ZstdHandler):
     func = handler.collect("func_with_code_block", {})
     html = handler.render(func, {})
-    print(html)
     assert '<pre><code class="language-cpp">' in html
 
 def test_handler_enum(handler: ZstdHandler):
     item = handler.collect("enum1", {})
     html = handler.render(item, {})
-    print(html)
     assert '<span class="n">enum1_value1</span><span class="w"> </span><span class="o">=</span><span class="w"> </span><span class="mi">0</span>' in html
     assert '<div class="highlight"><pre><span></span><code><span class="n">enum1_value2</span>\n</code></pre></div>' in html
     assert 'The first enum value.' in html
@@ -132,6 +117,5 @@ def test_typedef1(handler: ZstdHandler):
     item = handler.collect("typedef1", {})
     html = handler.render(item, {})
 
-    print(html)
     assert '<div class="highlight"><pre><span></span><code><span class="k">typedef</span><span class="w"> </span><span class="k">struct</span><span class="w"> </span><span class="nc">original</span><span class="w"> </span><span class="n">typedef1</span><span class="p">;</span>' in html
     assert 'This typedefs some original struct.' in html
\ No newline at end of file